@@ -3,61 +3,119 @@ Configuration module for Vibe Bar API.
 Handles environment variables and application settings.
 """
 
-import os
+from functools import cached_property, lru_cache
+from pathlib import Path
 from typing import Optional
-from dotenv import load_dotenv
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Load environment variables from .env file
-load_dotenv()
+# .env lives in the backend directory, independent of the working directory
+ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
 
-class Config:
+class Config(BaseSettings):
     """Application configuration class."""
-    
+
+    model_config = SettingsConfigDict(
+        env_file=ENV_FILE,
+        case_sensitive=False,
+        extra="ignore"
+    )
+
     # Environment
-    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
-    
+    ENVIRONMENT: str = "development"
+
     # Frontend Configuration
-    FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
-    
+    FRONTEND_URL: str = "http://localhost:3000"
+
     # OpenRouter Configuration
-    OPENROUTER_API_KEY: Optional[str] = os.getenv("OPENROUTER_API_KEY")
-    OPENROUTER_BASE_URL: str = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
-    DEFAULT_AI_MODEL: str = os.getenv("DEFAULT_AI_MODEL", "google/gemma-3-27b-it:free")
-    FALLBACK_AI_MODEL: str = os.getenv("FALLBACK_AI_MODEL", "openai/gpt-3.5-turbo")
-    
+    OPENROUTER_API_KEY: Optional[str] = None
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
+    DEFAULT_AI_MODEL: str = "google/gemma-3-27b-it:free"
+    FALLBACK_AI_MODEL: str = "openai/gpt-3.5-turbo"
+
     # AI Configuration
-    AI_TIMEOUT: int = int(os.getenv("AI_TIMEOUT", "30"))
-    AI_MAX_RETRIES: int = int(os.getenv("AI_MAX_RETRIES", "3"))
-    AI_TEMPERATURE: float = float(os.getenv("AI_TEMPERATURE", "0.7"))
-    AI_MAX_TOKENS: int = int(os.getenv("AI_MAX_TOKENS", "1000"))
-    
+    AI_TIMEOUT: int = 30
+    AI_MAX_RETRIES: int = 3
+    AI_TEMPERATURE: float = 0.7
+    AI_MAX_TOKENS: int = 1000
+    AI_MAX_CONCURRENCY: int = 32  # Upper bound on simultaneous OpenRouter calls
+    AI_HEALTH_CACHE_TTL: int = 10  # Seconds an AI health result is served before refreshing
+
+    # Recipe Cache Configuration (set RECIPE_CACHE_SIZE=0 to disable)
+    RECIPE_CACHE_SIZE: int = 1024
+    RECIPE_CACHE_TTL: int = 600  # Seconds a generated recipe is reused for identical preferences
+
     # Supabase Configuration
-    SUPABASE_URL: Optional[str] = os.getenv("SUPABASE_URL")
-    SUPABASE_ANON_KEY: Optional[str] = os.getenv("SUPABASE_ANON_KEY")
-    SUPABASE_SERVICE_KEY: Optional[str] = os.getenv("SUPABASE_SERVICE_KEY")
-    
-    @classmethod
-    def is_development(cls) -> bool:
+    SUPABASE_URL: Optional[str] = None
+    SUPABASE_ANON_KEY: Optional[str] = None
+    SUPABASE_SERVICE_KEY: Optional[str] = None
+    DB_POOL_SIZE: int = 25  # Threads available for concurrent Supabase queries
+
+    # Redis response cache for Community Vibes reads (disabled when REDIS_URL is unset)
+    REDIS_URL: Optional[str] = None
+    CACHE_RECIPE_TTL: int = 900  # Seconds a single recipe is served from the cache
+    CACHE_LIST_TTL: int = 60  # Seconds a recipe list page is served from the cache
+    CACHE_STATS_TTL: int = 300  # Seconds community stats and tags are served from the cache
+
+    # Batch endpoint
+    BATCH_MAX_CONCURRENCY: int = 5  # Sub-requests of one batch that run at the same time
+
+    # Derived flags; the environment cannot change after start-up
+    @cached_property
+    def IS_DEVELOPMENT(self) -> bool:
+        """Whether running in development mode."""
+        return self.ENVIRONMENT.lower() == "development"
+
+    @cached_property
+    def IS_PRODUCTION(self) -> bool:
+        """Whether running in production mode."""
+        return self.ENVIRONMENT.lower() == "production"
+
+    @cached_property
+    def ALLOWED_ORIGINS(self) -> frozenset:
+        """Origins allowed to call the API with credentials (CORS)."""
+        # Browsers send the Origin without a trailing slash, so normalize FRONTEND_URL
+        # and drop it when unset rather than allowing an empty origin
+        return frozenset({
+            "http://localhost:3000",  # Development frontend
+            "https://localhost:3000",  # Development frontend (HTTPS)
+            "http://localhost:3001",  # Second local frontend
+            "http://127.0.0.1:3000",  # Alternative localhost
+            self.FRONTEND_URL.strip().rstrip("/"),  # Production frontend
+        } - {""})
+
+    @cached_property
+    def OPENROUTER_CONFIGURED(self) -> bool:
+        """Whether OpenRouter is properly configured."""
+        return self.OPENROUTER_API_KEY is not None and self.OPENROUTER_API_KEY.strip() != ""
+
+    @cached_property
+    def SUPABASE_CONFIGURED(self) -> bool:
+        """Whether Supabase is properly configured."""
+        return (
+            self.SUPABASE_URL is not None and self.SUPABASE_URL.strip() != "" and
+            self.SUPABASE_ANON_KEY is not None and self.SUPABASE_ANON_KEY.strip() != ""
+        )
+
+    def is_development(self) -> bool:
         """Check if running in development mode."""
-        return cls.ENVIRONMENT.lower() == "development"
-    
-    @classmethod
-    def is_production(cls) -> bool:
+        return self.IS_DEVELOPMENT
+
+    def is_production(self) -> bool:
         """Check if running in production mode."""
-        return cls.ENVIRONMENT.lower() == "production"
-    
-    @classmethod
-    def validate_openrouter_config(cls) -> bool:
+        return self.IS_PRODUCTION
+
+    def validate_openrouter_config(self) -> bool:
         """Validate that OpenRouter is properly configured."""
-        return cls.OPENROUTER_API_KEY is not None and cls.OPENROUTER_API_KEY.strip() != ""
-    
-    @classmethod
-    def validate_supabase_config(cls) -> bool:
+        return self.OPENROUTER_CONFIGURED
+
+    def validate_supabase_config(self) -> bool:
         """Validate that Supabase is properly configured."""
-        return (
-            cls.SUPABASE_URL is not None and cls.SUPABASE_URL.strip() != "" and
-            cls.SUPABASE_ANON_KEY is not None and cls.SUPABASE_ANON_KEY.strip() != ""
-        )
+        return self.SUPABASE_CONFIGURED
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Load the settings from the environment and .env file once."""
+    return Config()
 
 # Global config instance
-config = Config() 
\ No newline at end of file
+config = get_config()
@@ -2,8 +2,14 @@
 Pydantic models for Vibe Bar application - focused on cocktail recipe generation
 """
 
-from .common import APIResponse, ErrorResponse, PaginationParams, FilterParams, HealthCheck
-from .cocktail import UserPreferences, CocktailRecipe, RecipeMeta, RecipeIngredient, RecipeDetail
+from .common import (
+    APIResponse, ErrorResponse, PaginationParams, FilterParams, HealthCheck,
+    BatchRequestItem, BatchRequest
+)
+from .cocktail import (
+    UserPreferences, CocktailRecipe, RecipeMeta, RecipeIngredient, RecipeDetail,
+    CreatorInfo, SaveRecipeRequest
+)
 from .community_vibes import (
     CommunityVibeRecipeCreate,
     CommunityVibeRecipeUpdate,
@@ -11,6 +17,8 @@ from .community_vibes import (
     CommunityVibeRecipeResponse,
     CommunityVibeRecipeList,
     CommunityVibeRecipeFilters,
+    RecipeListItem,
+    SavedRecipeInfo,
     RecipeRating,
     RecipeStats
 )
@@ -22,6 +30,8 @@ __all__ = [
     "PaginationParams",
     "FilterParams",
     "HealthCheck",
+    "BatchRequestItem",
+    "BatchRequest",
     
     # Cocktail models
     "UserPreferences",
@@ -29,6 +39,8 @@ __all__ = [
     "RecipeMeta",
     "RecipeIngredient", 
     "RecipeDetail",
+    "CreatorInfo",
+    "SaveRecipeRequest",
     
     # Community Vibes models
     "CommunityVibeRecipeCreate",
@@ -37,6 +49,8 @@ __all__ = [
     "CommunityVibeRecipeResponse",
     "CommunityVibeRecipeList",
     "CommunityVibeRecipeFilters",
+    "RecipeListItem",
+    "SavedRecipeInfo",
     "RecipeRating",
     "RecipeStats",
 ] 
\ No newline at end of file
@@ -3,11 +3,14 @@ Simple cocktail recipe models for Vibe Bar application
 """
 
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class UserPreferences(BaseModel):
     """Request model matching frontend input data structure"""
+    # Built once per request and never modified afterwards
+    model_config = ConfigDict(frozen=True)
+
     ingredients: List[str] = []
     customIngredients: Optional[str] = None
     flavors: List[str] = []
@@ -40,4 +43,17 @@ class CocktailRecipe(BaseModel):
     recipeMeta: List[RecipeMeta]  # [prep time, difficulty, servings]
     recipeIngredients: List[RecipeIngredient]
     recipeInstructions: List[str]
-    recipeDetails: List[RecipeDetail]  # [glassware, garnish] 
\ No newline at end of file
+    recipeDetails: List[RecipeDetail]  # [glassware, garnish]
+
+
+class CreatorInfo(BaseModel):
+    """Who is saving a generated recipe"""
+    name: Optional[str] = "Anonymous"
+    email: Optional[str] = None
+
+
+class SaveRecipeRequest(BaseModel):
+    """Request model for saving a generated recipe"""
+    recipe: CocktailRecipe
+    preferences: UserPreferences = Field(default_factory=UserPreferences)
+    creator: CreatorInfo = Field(default_factory=CreatorInfo)
@@ -2,10 +2,17 @@
 Common Pydantic models and utilities
 """
 
+import posixpath
 from datetime import datetime, UTC
+from functools import partial
 from typing import Optional, Any, Dict, List
+from urllib.parse import unquote, urlsplit
 from pydantic import BaseModel, Field, field_validator
 
+# Timestamp default for response models; a partial of the C-level datetime.now
+# avoids a Python lambda frame on every instance
+utc_now = partial(datetime.now, UTC)
+
 
 class APIResponse(BaseModel):
     """Standard API response wrapper"""
@@ -13,7 +20,7 @@ class APIResponse(BaseModel):
     message: str = "Operation successful"
     data: Optional[Any] = None
     errors: Optional[List[str]] = None
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    timestamp: datetime = Field(default_factory=utc_now)
 
 
 class ErrorResponse(BaseModel):
@@ -22,7 +29,7 @@ class ErrorResponse(BaseModel):
     message: str
     error_code: Optional[str] = None
     details: Optional[Dict[str, Any]] = None
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    timestamp: datetime = Field(default_factory=utc_now)
 
 
 class PaginationParams(BaseModel):
@@ -52,6 +59,37 @@ class HealthCheck(BaseModel):
     status: str = "healthy"
     service: str = "vibe-bar-api"
     version: str = "0.1.0"
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    timestamp: datetime = Field(default_factory=utc_now)
     database_connected: bool = True
-    dependencies: Dict[str, bool] = Field(default_factory=dict) 
\ No newline at end of file
+    dependencies: Dict[str, bool] = Field(default_factory=dict)
+
+
+class BatchRequestItem(BaseModel):
+    """One sub-request inside a batch call"""
+    id: str = Field(..., min_length=1, max_length=50, description="Client-chosen id echoed in the response")
+    method: str = Field(default="GET", description="HTTP method")
+    url: str = Field(..., description="API path, e.g. /api/community-vibes/stats")
+    body: Optional[Any] = Field(None, description="JSON body for POST/PUT requests")
+
+    @field_validator('method')
+    @classmethod
+    def validate_method(cls, v):
+        v = v.upper()
+        if v not in ['GET', 'POST', 'PUT', 'DELETE']:
+            raise ValueError('method must be one of GET, POST, PUT, DELETE')
+        return v
+
+    @field_validator('url')
+    @classmethod
+    def validate_url(cls, v):
+        # Check the path the app will route, after percent-decoding and dot-segment
+        # removal, so /api/%62atch or /api/./batch cannot reach /api/batch
+        path = posixpath.normpath(unquote(urlsplit(v).path))
+        if not v.startswith('/api/') or not path.startswith('/api/') or path.startswith('/api/batch'):
+            raise ValueError('url must be an /api/ path other than /api/batch')
+        return v
+
+
+class BatchRequest(BaseModel):
+    """Several API calls submitted in one request"""
+    requests: List[BatchRequestItem] = Field(..., min_length=1, max_length=20, description="Sub-requests to run")
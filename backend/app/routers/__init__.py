@@ -1,3 +1,35 @@
 """
 API routers for Vibe Bar application.
-""" 
\ No newline at end of file
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+from app.models.common import utc_now
+
+
+class _EnvelopeResponse(ORJSONResponse):
+    """ORJSONResponse that writes UTC datetimes with a Z suffix, as APIResponse does"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def ok(message: str, data: Any = None, status_code: int = 200) -> ORJSONResponse:
+    """
+    Render the standard APIResponse envelope straight from a dict, skipping model
+    construction and response_model validation. data must hold plain values
+    (dicts, lists, scalars, UUIDs, datetimes), not pydantic models.
+    """
+    return _EnvelopeResponse(
+        {
+            "success": True,
+            "message": message,
+            "data": data,
+            "errors": None,
+            "timestamp": utc_now()
+        },
+        status_code=status_code
+    )
@@ -0,0 +1,75 @@
+"""
+Batch API router.
+Runs several API calls from one HTTP request so clients can coalesce round-trips.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict
+
+import httpx
+import orjson
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.config import config
+from app.models import APIResponse, BatchRequest, BatchRequestItem
+
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(
+    prefix="/api",
+    tags=["Batch"],
+)
+
+# Sent on every sub-request; a batch that receives it was reached from another batch
+BATCH_MARKER_HEADER = "X-Batch-Sub-Request"
+
+async def _run_sub_request(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    item: BatchRequestItem
+) -> Dict[str, Any]:
+    """Dispatch one sub-request through the app and capture its result"""
+    async with semaphore:
+        response = await client.request(item.method, item.url, json=item.body)
+    if response.headers.get("content-type", "").startswith("application/json"):
+        body = orjson.loads(response.content)
+    else:
+        body = response.text
+    return {"id": item.id, "status": response.status_code, "body": body}
+
+@router.post("/batch", response_model=APIResponse)
+async def batch(payload: BatchRequest, request: Request):
+    """
+    Run up to 20 API calls, BATCH_MAX_CONCURRENCY at a time, and return every
+    result in one response.
+    Sub-requests are dispatched in-process through the ASGI app, so they reuse the
+    existing endpoints without a second network hop.
+    """
+    # Second line of defence behind the url validator: never fan out recursively
+    if BATCH_MARKER_HEADER in request.headers:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batches cannot be nested"
+        )
+
+    # A failing sub-request becomes its 500 response instead of failing the batch
+    transport = httpx.ASGITransport(app=request.app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://batch",
+        # Skip compressing sub-responses that never leave the process
+        headers={"Accept-Encoding": "identity", BATCH_MARKER_HEADER: "1"}
+    ) as client:
+        # Bound how much work one batch can start at once
+        semaphore = asyncio.Semaphore(config.BATCH_MAX_CONCURRENCY)
+        responses = await asyncio.gather(
+            *(_run_sub_request(client, semaphore, item) for item in payload.requests)
+        )
+
+    logger.info("Batch of %d requests completed", len(responses))
+    return APIResponse(
+        message="Batch completed",
+        data={"responses": responses}
+    )
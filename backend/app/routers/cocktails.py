@@ -0,0 +1,140 @@
+"""
+Cocktails API router.
+Handles AI recipe generation (buffered and streamed) and saving generated recipes.
+"""
+
+import logging
+from typing import Any, Optional
+import httpx
+from fastapi import APIRouter, Depends, Body
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+
+from app.models import APIResponse, SaveRecipeRequest, SavedRecipeInfo, UserPreferences
+from app.services import get_cocktail_service, get_community_vibes_service, recipe_cache, OpenRouterError
+
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(
+    prefix="/api/cocktails",
+    tags=["Cocktails"],
+)
+
+# =============================================================================
+# COCKTAIL RECIPE GENERATION ENDPOINT
+# =============================================================================
+
+@router.post("/generate", response_model=APIResponse)
+async def generate_cocktail_recipe(
+    preferences: UserPreferences = Body(
+        ...,
+        example={
+            "ingredients": ["vodka"],
+            "customIngredients": "",
+            "flavors": ["sweet"],
+            "vibe": "date night",
+            "specialRequests": "no eggs",
+            "model": "anthropic/claude-3-haiku"
+        }
+    ),
+    cocktail_service = Depends(get_cocktail_service)
+):
+    """Generate a cocktail recipe based on user preferences"""
+    # Lazy %-formatting: the message is only built if the record is emitted
+    logger.info("Generating cocktail recipe for vibe=%s model=%s", preferences.vibe, preferences.model)
+    
+    # Identical preferences are served from the recipe cache
+    recipe = await recipe_cache.get_or_generate(
+        recipe_cache.make_key(preferences),
+        lambda: cocktail_service.generate_cocktail_recipe(preferences)
+    )
+    
+    # Serialize in a single pass and bypass FastAPI's response_model re-validation
+    response = APIResponse(
+        message="Cocktail recipe generated successfully",
+        data=recipe
+    )
+    return ORJSONResponse(response.model_dump(mode="json"))
+
+def _sse_event(data: Any, event: Optional[str] = None) -> bytes:
+    """Encode one Server-Sent Events frame"""
+    frame = b"data: " + orjson.dumps(data) + b"\n\n"
+    if event:
+        frame = f"event: {event}\n".encode() + frame
+    return frame
+
+@router.post("/generate/stream")
+async def stream_cocktail_recipe(
+    preferences: UserPreferences,
+    cocktail_service = Depends(get_cocktail_service)
+):
+    """
+    Stream a cocktail recipe as Server-Sent Events so the client can render
+    tokens as they arrive. Each frame carries a {"delta": ...} text chunk of the
+    recipe JSON; the stream ends with a "done" event or an "error" event.
+    """
+    async def event_stream():
+        try:
+            async for delta in cocktail_service.stream_cocktail_recipe(preferences):
+                yield _sse_event({"delta": delta})
+        except (OpenRouterError, httpx.HTTPError):
+            # Upstream error text stays in the log, as with the buffered endpoint
+            logger.exception("Error streaming cocktail recipe")
+            yield _sse_event({"message": "AI service error"}, event="error")
+            return
+        yield _sse_event({}, event="done")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Stop proxies such as nginx from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# =============================================================================
+# RECIPE SAVING ENDPOINT
+# =============================================================================
+
+@router.post("/save", response_model=APIResponse)
+async def save_cocktail_recipe(
+    payload: SaveRecipeRequest = Body(
+        ...,
+        example={
+            "recipe": {
+                "recipeTitle": "Midnight Garden",
+                "recipeDescription": "A sophisticated gin-based cocktail",
+                "recipeMeta": [{"text": "5 min prep"}, {"text": "Easy"}, {"text": "1 serving"}],
+                "recipeIngredients": [{"name": "Gin", "amount": "2 oz"}],
+                "recipeInstructions": ["Combine ingredients", "Stir and serve"],
+                "recipeDetails": [{"title": "Glassware", "content": "Coupe glass"}]
+            },
+            "preferences": {
+                "ingredients": ["gin"],
+                "flavors": ["botanical"],
+                "vibe": "relaxing",
+                "model": "anthropic/claude-3-haiku"
+            },
+            "creator": {
+                "name": "John Doe",
+                "email": "john@example.com"
+            }
+        }
+    ),
+    community_service = Depends(get_community_vibes_service)
+):
+    """Save a generated cocktail recipe to the database"""
+    # FastAPI has already validated the whole nested payload in a single pass
+    saved_recipe = await community_service.create_recipe_from_ai_generation(
+        ai_recipe=payload.recipe,
+        user_preferences=payload.preferences,
+        creator_name=payload.creator.name,
+        creator_email=payload.creator.email
+    )
+    
+    logger.info(f"Successfully saved recipe: {saved_recipe.name} (ID: {saved_recipe.id})")
+    
+    return APIResponse(
+        message="Recipe saved successfully",
+        data=SavedRecipeInfo.model_validate(saved_recipe).model_dump(mode="json")
+    )
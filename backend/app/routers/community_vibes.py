@@ -4,10 +4,13 @@ Handles all endpoints for Community Vibes recipes - user-generated cocktail reci
 """
 
 import logging
+import re
 from typing import List, Optional
 from uuid import UUID
+import httpx
 from fastapi import APIRouter, HTTPException, Depends, Query, Body, status
-from fastapi.responses import JSONResponse
+from postgrest.exceptions import APIError
+from pydantic import TypeAdapter, ValidationError
 
 from app.models import (
     APIResponse,
@@ -22,7 +25,11 @@ from app.models import (
     UserPreferences,
     CocktailRecipe
 )
-from app.services import get_community_vibes_service, get_cocktail_service
+from app.models.community_vibes import DIFFICULTY_BY_LOWER
+from app.services import CommunityVibesService, DatabaseError, community_vibes_service, get_cocktail_service, response_cache
+from app.services.response_cache import STATS_KEY
+from app.routers import ok
+from app.config import config
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +40,31 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# Dependency to get Community Vibes service
-def get_community_service():
-    return get_community_vibes_service()
+# Failures an endpoint expects from the database and from payload validation. Anything
+# else, OpenRouterError included, falls through to the app-wide handlers in main.py
+_SERVICE_ERRORS = (DatabaseError, APIError, httpx.HTTPError, ValidationError)
+# Generation can also fail on malformed LLM output
+_GENERATION_ERRORS = (*_SERVICE_ERRORS, ValueError, KeyError)
+
+# Splits the comma-separated tags query parameter, swallowing whitespace around commas
+_TAG_SPLIT = re.compile(r"\s*,\s*")
+
+# Serializes a whole page of recipes in one pydantic-core call instead of one per item
+_RECIPE_LIST_ADAPTER = TypeAdapter(List[CommunityVibeRecipe])
+
+# Dependency to get Community Vibes service. It hands back the prebuilt singleton and
+# is async so FastAPI resolves it inline rather than dispatching to the threadpool
+async def get_community_service() -> CommunityVibesService:
+    return community_vibes_service
+
+async def _get_stats_payload(community_service) -> dict:
+    """Community stats as a JSON-ready dict, shared by /stats and /tags through the cache"""
+    payload = await response_cache.get(STATS_KEY)
+    if payload is None:
+        stats = await community_service.get_community_stats()
+        payload = stats.model_dump(mode="json")
+        await response_cache.set(STATS_KEY, payload, config.CACHE_STATS_TTL)
+    return payload
 
 # =============================================================================
 # RECIPE CRUD ENDPOINTS
@@ -75,23 +104,25 @@ async def create_recipe(
     """Create a new Community Vibe recipe."""
     try:
         recipe = await community_service.create_recipe(recipe_data)
+        await response_cache.invalidate()
         
-        return APIResponse(
+        return ok(
             message="Community Vibe recipe created successfully",
             data={
-                "recipe_id": str(recipe.id),
+                "recipe_id": recipe.id,
                 "name": recipe.name,
                 "creator": recipe.creator_name,
-                "created_at": recipe.created_at.isoformat()
-            }
+                "created_at": recipe.created_at
+            },
+            status_code=status.HTTP_201_CREATED
         )
         
-    except Exception as e:
-        logger.error(f"Failed to create Community Vibe recipe: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to create Community Vibe recipe")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create recipe: {str(e)}"
-        )
+            detail="Failed to create recipe"
+        ) from e
 
 @router.get("/recipes", response_model=APIResponse)
 async def get_recipes(
@@ -115,9 +146,17 @@ async def get_recipes(
         if search:
             filters.search = search
         if tags:
-            filters.tags = [tag.strip() for tag in tags.split(",")]
+            filters.tags = [tag for tag in _TAG_SPLIT.split(tags.strip()) if tag] or None
         if difficulty_level:
-            filters.difficulty_level = difficulty_level
+            # Case-insensitive lookup; unknown levels are rejected rather than stored
+            # in the Literal-typed filter
+            level = DIFFICULTY_BY_LOWER.get(difficulty_level.lower())
+            if level is None:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"difficulty_level must be one of: {', '.join(DIFFICULTY_BY_LOWER.values())}"
+                )
+            filters.difficulty_level = level
         if min_rating is not None:
             filters.min_rating = min_rating
         if creator_name:
@@ -127,26 +166,37 @@ async def get_recipes(
         if is_featured is not None:
             filters.is_featured = is_featured
         
-        # Pass sorting parameters to the service
-        recipes = await community_service.get_recipes(
-            filters=filters, 
-            page=page, 
-            per_page=per_page,
-            sort_by=sort_by,
-            sort_order=sort_order
-        )
+        cache_key = response_cache.list_key("recipes", {
+            **filters.model_dump(mode="json"),
+            "page": page,
+            "per_page": per_page,
+            "sort_by": sort_by,
+            "sort_order": sort_order
+        })
+        data = await response_cache.get(cache_key)
+        if data is None:
+            # Pass sorting parameters to the service
+            recipes = await community_service.get_recipes(
+                filters=filters, 
+                page=page, 
+                per_page=per_page,
+                sort_by=sort_by,
+                sort_order=sort_order
+            )
+            data = recipes.model_dump(mode="json")
+            await response_cache.set(cache_key, data, config.CACHE_LIST_TTL)
         
-        return APIResponse(
+        return ok(
             message="Community Vibe recipes retrieved successfully",
-            data=recipes.model_dump()
+            data=data
         )
         
-    except Exception as e:
-        logger.error(f"Failed to get Community Vibe recipes: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to get Community Vibe recipes")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get recipes: {str(e)}"
-        )
+            detail="Failed to get recipes"
+        ) from e
 
 @router.get("/recipes/{recipe_id}", response_model=APIResponse)
 async def get_recipe(
@@ -155,27 +205,36 @@ async def get_recipe(
 ):
     """Get a specific Community Vibe recipe by ID."""
     try:
-        recipe = await community_service.get_recipe(recipe_id)
-        
-        if not recipe:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Recipe not found"
-            )
-        
-        return APIResponse(
+        cache_key = response_cache.recipe_key(recipe_id)
+        data = await response_cache.get(cache_key)
+        if data is None:
+            recipe = await community_service.get_recipe(recipe_id)
+            
+            if not recipe:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Recipe not found"
+                )
+            
+            data = recipe.model_dump(mode="json")
+            await response_cache.set(cache_key, data, config.CACHE_RECIPE_TTL)
+        else:
+            # A cached hit is still a view; count it and patch in the fresh total
+            view_count = await community_service.record_view(recipe_id)
+            if view_count is not None:
+                data["view_count"] = view_count
+        
+        return ok(
             message="Recipe retrieved successfully",
-            data=recipe.model_dump()
+            data=data
         )
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get recipe {recipe_id}: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to get recipe %s", recipe_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get recipe: {str(e)}"
-        )
+            detail="Failed to get recipe"
+        ) from e
 
 @router.put("/recipes/{recipe_id}", response_model=APIResponse)
 async def update_recipe(
@@ -185,40 +244,32 @@ async def update_recipe(
 ):
     """Update a Community Vibe recipe."""
     try:
-        # Check if recipe exists
-        existing_recipe = await community_service.get_recipe(recipe_id)
-        if not existing_recipe:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Recipe not found"
-            )
-        
-        # Update recipe
+        # A single UPDATE ... RETURNING; no rows back means the recipe does not exist
         updated_recipe = await community_service.update_recipe(recipe_id, update_data)
         
         if not updated_recipe:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update recipe"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Recipe not found"
             )
         
-        return APIResponse(
+        await response_cache.invalidate(recipe_id)
+        
+        return ok(
             message="Recipe updated successfully",
             data={
-                "recipe_id": str(updated_recipe.id),
+                "recipe_id": updated_recipe.id,
                 "name": updated_recipe.name,
-                "updated_at": updated_recipe.updated_at.isoformat()
+                "updated_at": updated_recipe.updated_at
             }
         )
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to update recipe {recipe_id}: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to update recipe %s", recipe_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update recipe: {str(e)}"
-        )
+            detail="Failed to update recipe"
+        ) from e
 
 @router.delete("/recipes/{recipe_id}", response_model=APIResponse)
 async def delete_recipe(
@@ -227,36 +278,28 @@ async def delete_recipe(
 ):
     """Delete a Community Vibe recipe."""
     try:
-        # Check if recipe exists
-        existing_recipe = await community_service.get_recipe(recipe_id)
-        if not existing_recipe:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Recipe not found"
-            )
-        
-        # Delete recipe
+        # A single DELETE ... RETURNING; no rows back means the recipe does not exist
         success = await community_service.delete_recipe(recipe_id)
         
         if not success:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete recipe"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Recipe not found"
             )
         
-        return APIResponse(
+        await response_cache.invalidate(recipe_id)
+        
+        return ok(
             message="Recipe deleted successfully",
-            data={"recipe_id": str(recipe_id)}
+            data={"recipe_id": recipe_id}
         )
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to delete recipe {recipe_id}: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to delete recipe %s", recipe_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete recipe: {str(e)}"
-        )
+            detail="Failed to delete recipe"
+        ) from e
 
 # =============================================================================
 # AI RECIPE CONVERSION ENDPOINTS
@@ -278,26 +321,28 @@ async def save_ai_recipe_as_community_vibe(
             creator_name=creator_name,
             creator_email=creator_email
         )
+        await response_cache.invalidate()
         
-        return APIResponse(
+        return ok(
             message="AI-generated recipe saved as Community Vibe successfully",
             data={
-                "recipe_id": str(recipe.id),
+                "recipe_id": recipe.id,
                 "name": recipe.name,
                 "original_ai_title": ai_recipe.recipeTitle,
                 "creator": recipe.creator_name,
                 "vibe": recipe.vibe,
                 "ai_model_used": recipe.ai_model_used,
-                "created_at": recipe.created_at.isoformat()
-            }
+                "created_at": recipe.created_at
+            },
+            status_code=status.HTTP_201_CREATED
         )
         
-    except Exception as e:
-        logger.error(f"Failed to save AI recipe as Community Vibe: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to save AI recipe as Community Vibe")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save AI recipe: {str(e)}"
-        )
+            detail="Failed to save AI recipe"
+        ) from e
 
 @router.post("/recipes/generate-and-save", response_model=APIResponse, status_code=status.HTTP_201_CREATED)
 async def generate_and_save_recipe(
@@ -319,26 +364,28 @@ async def generate_and_save_recipe(
             creator_name=creator_name,
             creator_email=creator_email
         )
+        await response_cache.invalidate()
         
-        return APIResponse(
+        return ok(
             message="Recipe generated and saved as Community Vibe successfully",
             data={
-                "recipe_id": str(recipe.id),
+                "recipe_id": recipe.id,
                 "name": recipe.name,
                 "creator": recipe.creator_name,
                 "vibe": recipe.vibe,
                 "ai_model_used": recipe.ai_model_used,
-                "generated_recipe": ai_recipe.model_dump(),
-                "created_at": recipe.created_at.isoformat()
-            }
+                "generated_recipe": ai_recipe.model_dump(mode="json"),
+                "created_at": recipe.created_at
+            },
+            status_code=status.HTTP_201_CREATED
         )
         
-    except Exception as e:
-        logger.error(f"Failed to generate and save recipe: {e}")
+    except _GENERATION_ERRORS as e:
+        logger.exception("Failed to generate and save recipe")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate and save recipe: {str(e)}"
-        )
+            detail="Failed to generate and save recipe"
+        ) from e
 
 # =============================================================================
 # RATING AND FEEDBACK ENDPOINTS
@@ -360,43 +407,36 @@ async def rate_recipe(
 ):
     """Rate a Community Vibe recipe."""
     try:
-        # Check if recipe exists
-        recipe = await community_service.get_recipe(recipe_id)
-        if not recipe:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Recipe not found"
-            )
-        
         # Set recipe_id in rating data
         rating_data.recipe_id = recipe_id
         
-        # Submit rating
+        # Submit rating; the database reports a missing recipe in the same call
         success = await community_service.rate_recipe(rating_data)
         
         if not success:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to submit rating"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Recipe not found"
             )
         
-        return APIResponse(
+        await response_cache.invalidate(recipe_id)
+        
+        return ok(
             message="Rating submitted successfully",
             data={
-                "recipe_id": str(recipe_id),
+                "recipe_id": recipe_id,
                 "rating": rating_data.rating,
                 "reviewer": rating_data.reviewer_name
-            }
+            },
+            status_code=status.HTTP_201_CREATED
         )
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to rate recipe {recipe_id}: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to rate recipe %s", recipe_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to submit rating: {str(e)}"
-        )
+            detail="Failed to submit rating"
+        ) from e
 
 # =============================================================================
 # SEARCH AND DISCOVERY ENDPOINTS
@@ -412,21 +452,21 @@ async def search_recipes(
     try:
         recipes = await community_service.search_recipes(q, limit)
         
-        return APIResponse(
+        return ok(
             message=f"Found {len(recipes)} recipes matching '{q}'",
             data={
                 "search_query": q,
                 "total_results": len(recipes),
-                "recipes": [recipe.model_dump() for recipe in recipes]
+                "recipes": _RECIPE_LIST_ADAPTER.dump_python(recipes, mode="json")
             }
         )
         
-    except Exception as e:
-        logger.error(f"Failed to search recipes: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to search recipes")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to search recipes: {str(e)}"
-        )
+            detail="Failed to search recipes"
+        ) from e
 
 @router.get("/recipes/featured", response_model=APIResponse)
 async def get_featured_recipes(
@@ -435,23 +475,28 @@ async def get_featured_recipes(
 ):
     """Get featured Community Vibe recipes."""
     try:
-        filters = CommunityVibeRecipeFilters(is_featured=True)
-        recipes = await community_service.get_recipes(filters, page=1, per_page=limit)
-        
-        return APIResponse(
-            message="Featured recipes retrieved successfully",
-            data={
+        cache_key = response_cache.list_key("featured", {"limit": limit})
+        data = await response_cache.get(cache_key)
+        if data is None:
+            filters = CommunityVibeRecipeFilters(is_featured=True)
+            recipes = await community_service.get_recipes(filters, page=1, per_page=limit)
+            data = {
                 "total_featured": recipes.total_count,
-                "recipes": [recipe.model_dump() for recipe in recipes.recipes]
+                "recipes": _RECIPE_LIST_ADAPTER.dump_python(recipes.recipes, mode="json")
             }
+            await response_cache.set(cache_key, data, config.CACHE_LIST_TTL)
+        
+        return ok(
+            message="Featured recipes retrieved successfully",
+            data=data
         )
         
-    except Exception as e:
-        logger.error(f"Failed to get featured recipes: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to get featured recipes")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get featured recipes: {str(e)}"
-        )
+            detail="Failed to get featured recipes"
+        ) from e
 
 @router.get("/recipes/by-creator/{creator_name}", response_model=APIResponse)
 async def get_recipes_by_creator(
@@ -462,12 +507,16 @@ async def get_recipes_by_creator(
 ):
     """Get recipes by a specific creator."""
     try:
-        filters = CommunityVibeRecipeFilters(creator_name=creator_name)
-        recipes = await community_service.get_recipes(filters, page, per_page)
-        
-        return APIResponse(
-            message=f"Recipes by {creator_name} retrieved successfully",
-            data={
+        cache_key = response_cache.list_key("by-creator", {
+            "creator_name": creator_name,
+            "page": page,
+            "per_page": per_page
+        })
+        data = await response_cache.get(cache_key)
+        if data is None:
+            filters = CommunityVibeRecipeFilters(creator_name=creator_name)
+            recipes = await community_service.get_recipes(filters, page, per_page)
+            data = {
                 "creator_name": creator_name,
                 "pagination": {
                     "page": recipes.page,
@@ -475,16 +524,21 @@ async def get_recipes_by_creator(
                     "total_count": recipes.total_count,
                     "total_pages": recipes.total_pages
                 },
-                "recipes": [recipe.model_dump() for recipe in recipes.recipes]
+                "recipes": _RECIPE_LIST_ADAPTER.dump_python(recipes.recipes, mode="json")
             }
+            await response_cache.set(cache_key, data, config.CACHE_LIST_TTL)
+        
+        return ok(
+            message=f"Recipes by {creator_name} retrieved successfully",
+            data=data
         )
         
-    except Exception as e:
-        logger.error(f"Failed to get recipes by creator {creator_name}: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to get recipes by creator %s", creator_name)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get recipes by creator: {str(e)}"
-        )
+            detail="Failed to get recipes by creator"
+        ) from e
 
 # =============================================================================
 # COMMUNITY STATISTICS ENDPOINTS
@@ -496,19 +550,17 @@ async def get_community_statistics(
 ):
     """Get Community Vibes statistics and metrics."""
     try:
-        stats = await community_service.get_community_stats()
-        
-        return APIResponse(
+        return ok(
             message="Community statistics retrieved successfully",
-            data=stats.model_dump()
+            data=await _get_stats_payload(community_service)
         )
         
-    except Exception as e:
-        logger.error(f"Failed to get community statistics: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to get community statistics")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get community statistics: {str(e)}"
-        )
+            detail="Failed to get community statistics"
+        ) from e
 
 @router.get("/tags", response_model=APIResponse)
 async def get_popular_tags(
@@ -517,23 +569,23 @@ async def get_popular_tags(
 ):
     """Get most popular tags used in Community Vibe recipes."""
     try:
-        stats = await community_service.get_community_stats()
-        popular_tags = stats.most_popular_tags[:limit]
+        stats = await _get_stats_payload(community_service)
+        popular_tags = stats["most_popular_tags"][:limit]
         
-        return APIResponse(
+        return ok(
             message="Popular tags retrieved successfully",
             data={
-                "total_tags": len(stats.most_popular_tags),
+                "total_tags": len(stats["most_popular_tags"]),
                 "popular_tags": popular_tags
             }
         )
         
-    except Exception as e:
-        logger.error(f"Failed to get popular tags: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Failed to get popular tags")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get popular tags: {str(e)}"
-        )
+            detail="Failed to get popular tags"
+        ) from e
 
 # =============================================================================
 # HEALTH AND INFO ENDPOINTS
@@ -548,7 +600,7 @@ async def community_vibes_health_check(
         # Test basic functionality
         stats = await community_service.get_community_stats()
         
-        return APIResponse(
+        return ok(
             message="Community Vibes service is healthy",
             data={
                 "status": "healthy",
@@ -558,9 +610,9 @@ async def community_vibes_health_check(
             }
         )
         
-    except Exception as e:
-        logger.error(f"Community Vibes health check failed: {e}")
+    except _SERVICE_ERRORS as e:
+        logger.exception("Community Vibes health check failed")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Community Vibes service unhealthy: {str(e)}"
-        ) 
\ No newline at end of file
+            detail="Community Vibes service unhealthy"
+        ) from e 
\ No newline at end of file
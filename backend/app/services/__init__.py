@@ -4,8 +4,10 @@ Services module for Vibe Bar application - focused on cocktail recipe generation
 
 from .openrouter import OpenRouterService, get_openrouter_service, OpenRouterError, AIMessage, AIResponse
 from .cocktail_service import CocktailRecipeService, get_cocktail_service
-from .database import DatabaseService, database_service
+from .database import DatabaseService, DatabaseError, database_service
 from .community_vibes_service import CommunityVibesService, get_community_vibes_service, community_vibes_service
+from .recipe_cache import RecipeCache, recipe_cache
+from .response_cache import ResponseCache, response_cache
 
 __all__ = [
     # OpenRouter service
@@ -21,10 +23,19 @@ __all__ = [
     
     # Database service
     "DatabaseService",
+    "DatabaseError",
     "database_service",
     
     # Community Vibes service
     "CommunityVibesService",
     "get_community_vibes_service",
     "community_vibes_service",
+    
+    # Recipe cache
+    "RecipeCache",
+    "recipe_cache",
+    
+    # Response cache
+    "ResponseCache",
+    "response_cache",
 ] 
\ No newline at end of file
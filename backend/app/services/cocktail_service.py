@@ -2,29 +2,23 @@
 Simple Cocktail Recipe Generation Service using OpenRouter LLM
 """
 
-import json
 import logging
-from typing import Optional
+import re
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Tuple
+
+import orjson
 
 from app.services.openrouter import OpenRouterService, get_openrouter_service, AIMessage
 from app.models.cocktail import UserPreferences, CocktailRecipe, RecipeMeta, RecipeIngredient, RecipeDetail
 
 logger = logging.getLogger(__name__)
 
+# Markdown code fence the model sometimes wraps its JSON in
+_FENCE_RE = re.compile(r"\A```(?:json)?|```\Z")
 
-class CocktailRecipeService:
-    """Simple service for AI-powered cocktail recipe generation"""
-    
-    def __init__(self, ai_service: Optional[OpenRouterService] = None):
-        self.ai_service = ai_service or get_openrouter_service()
-        
-    async def generate_cocktail_recipe(self, preferences: UserPreferences) -> CocktailRecipe:
-        """Generate a cocktail recipe based on user preferences"""
-        try:
-            logger.info(f"Generating cocktail recipe for preferences: {preferences}")
-            
-            # Create the prompt
-            system_prompt = """You are a master mixologist creating cocktail recipes. 
+# The system prompt is identical for every request
+SYSTEM_PROMPT = """You are a master mixologist creating cocktail recipes. 
 You must respond with ONLY a valid JSON object in this exact format:
 
 {
@@ -52,33 +46,70 @@ IMPORTANT: For the recipeTitle, create sophisticated, unique, and memorable cock
 
 Create a creative, delicious cocktail recipe with an exceptional name."""
 
-            # Build user prompt from preferences
-            user_prompt = "Create a cocktail recipe with these preferences:\n"
-            
-            if preferences.ingredients:
-                user_prompt += f"Base ingredients: {', '.join(preferences.ingredients)}\n"
-            if preferences.customIngredients:
-                user_prompt += f"Additional ingredients: {preferences.customIngredients}\n"
-            if preferences.flavors:
-                user_prompt += f"Flavor profiles: {', '.join(preferences.flavors)}\n"
-            if preferences.vibe:
-                user_prompt += f"Vibe: {preferences.vibe}\n"
-            if preferences.specialRequests:
-                user_prompt += f"Special requests: {preferences.specialRequests}\n"
-                
-            if not any([preferences.ingredients, preferences.flavors, preferences.vibe]):
-                user_prompt += "Create a creative and delicious cocktail recipe.\n"
-                
-            user_prompt += "\nRespond with ONLY the JSON object, no markdown or extra text."
-            
-            # Log the prompt being sent to LLM for debugging
-            logger.info(f"Sending prompt to LLM: {user_prompt}")
-            logger.info(f"Using LLM model: {preferences.model or 'default'}")
+
+@lru_cache(maxsize=256)
+def _build_user_prompt(
+    ingredients: Tuple[str, ...],
+    customIngredients: Optional[str],
+    flavors: Tuple[str, ...],
+    vibe: Optional[str],
+    specialRequests: Optional[str]
+) -> str:
+    """Render the user prompt; cached because popular preference combinations repeat"""
+    user_prompt = "Create a cocktail recipe with these preferences:\n"
+    
+    if ingredients:
+        user_prompt += f"Base ingredients: {', '.join(ingredients)}\n"
+    if customIngredients:
+        user_prompt += f"Additional ingredients: {customIngredients}\n"
+    if flavors:
+        user_prompt += f"Flavor profiles: {', '.join(flavors)}\n"
+    if vibe:
+        user_prompt += f"Vibe: {vibe}\n"
+    if specialRequests:
+        user_prompt += f"Special requests: {specialRequests}\n"
+        
+    if not any([ingredients, flavors, vibe]):
+        user_prompt += "Create a creative and delicious cocktail recipe.\n"
+        
+    user_prompt += "\nRespond with ONLY the JSON object, no markdown or extra text."
+    
+    return user_prompt
+
+
+class CocktailRecipeService:
+    """Simple service for AI-powered cocktail recipe generation"""
+    
+    def __init__(self, ai_service: Optional[OpenRouterService] = None):
+        self.ai_service = ai_service or get_openrouter_service()
+        
+    def _build_messages(self, preferences: UserPreferences) -> List[AIMessage]:
+        """Build the system and user prompts for a recipe request"""
+        user_prompt = _build_user_prompt(
+            tuple(preferences.ingredients),
+            preferences.customIngredients,
+            tuple(preferences.flavors),
+            preferences.vibe,
+            preferences.specialRequests
+        )
+        
+        # Log the prompt being sent to LLM for debugging
+        logger.debug("Sending prompt to LLM: %s", user_prompt)
+        logger.debug("Using LLM model: %s", preferences.model or "default")
+        
+        messages = [
+            AIMessage(role="system", content=SYSTEM_PROMPT),
+            AIMessage(role="user", content=user_prompt)
+        ]
+        return messages
+
+    async def generate_cocktail_recipe(self, preferences: UserPreferences) -> CocktailRecipe:
+        """Generate a cocktail recipe based on user preferences"""
+        try:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Generating cocktail recipe for preferences: %s", preferences.model_dump_json())
             
-            messages = [
-                AIMessage(role="system", content=system_prompt),
-                AIMessage(role="user", content=user_prompt)
-            ]
+            messages = self._build_messages(preferences)
             
             # Call AI service
             ai_response = await self.ai_service.complete(
@@ -89,17 +120,10 @@ Create a creative, delicious cocktail recipe with an exceptional name."""
             )
             
             # Parse response - remove any markdown formatting
-            content = ai_response.content.strip()
-            if content.startswith('```json'):
-                content = content[7:]
-            if content.startswith('```'):
-                content = content[3:]
-            if content.endswith('```'):
-                content = content[:-3]
-            content = content.strip()
+            content = _FENCE_RE.sub("", ai_response.content.strip()).strip()
             
             # Parse JSON and create recipe
-            recipe_data = json.loads(content)
+            recipe_data = orjson.loads(content)
             
             return CocktailRecipe(
                 recipeTitle=recipe_data["recipeTitle"],
@@ -110,13 +134,27 @@ Create a creative, delicious cocktail recipe with an exceptional name."""
                 recipeDetails=[RecipeDetail(title=detail["title"], content=detail["content"]) for detail in recipe_data["recipeDetails"]]
             )
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse AI response as JSON: {e}")
             logger.error(f"AI response: {ai_response.content}")
             raise ValueError("AI returned invalid JSON response")
         except Exception as e:
             logger.error(f"Error generating cocktail recipe: {e}")
             raise
+    
+    async def stream_cocktail_recipe(self, preferences: UserPreferences) -> AsyncIterator[str]:
+        """Stream the raw recipe JSON text as the model generates it"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Streaming cocktail recipe for preferences: %s", preferences.model_dump_json())
+        
+        messages = self._build_messages(preferences)
+        async for delta in self.ai_service.stream_complete(
+            messages=messages,
+            model=preferences.model,
+            temperature=0.8,
+            max_tokens=1000,
+        ):
+            yield delta
 
 
 # Global service instance
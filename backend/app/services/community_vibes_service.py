@@ -6,9 +6,12 @@ ratings, favorites, and community features.
 
 import logging
 import math
+import re
+import time
 from datetime import datetime, UTC
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
+from pydantic import TypeAdapter
 
 from app.models.community_vibes import (
     CommunityVibeRecipe,
@@ -25,6 +28,19 @@ from app.services.database import database_service
 
 logger = logging.getLogger(__name__)
 
+# Patterns for pulling prep time and servings out of recipe meta text
+_PREP_TIME_RE = re.compile(r'(\d+)\s*(minute|min|hour|hr)')
+_SERVINGS_RE = re.compile(r'(\d+)\s*(serving|portion|drink)')
+
+# Validates a page of database rows in one pydantic-core call
+_RECIPE_LIST_ADAPTER = TypeAdapter(List[CommunityVibeRecipe])
+
+# Seconds a computed RecipeStats is reused before asking the database again
+_STATS_MEMO_TTL = 60
+
+# Columns recipe lists may be sorted by; anything else falls back to created_at
+_SORT_COLUMNS = frozenset(("created_at", "rating_average", "prep_time_minutes", "name"))
+
 class CommunityVibesService:
     """Service for managing Community Vibes recipes and related operations."""
     
@@ -33,6 +49,8 @@ class CommunityVibesService:
         self.db = database_service
         self.table_name = "community_vibes_recipes"
         self.ratings_table = "recipe_ratings"
+        # (computed_at, stats) from the last get_community_stats call
+        self._stats_memo: Optional[Tuple[float, RecipeStats]] = None
     
     async def create_recipe_from_ai_generation(
         self, 
@@ -66,11 +84,12 @@ class CommunityVibesService:
             # Extract metadata if available
             if ai_recipe.recipeMeta:
                 for meta in ai_recipe.recipeMeta:
-                    if "difficulty" in meta.text.lower():
+                    text_lower = meta.text.lower()
+                    if "difficulty" in text_lower:
                         recipe_data.difficulty_level = self._extract_difficulty(meta.text)
-                    elif "prep" in meta.text.lower() or "time" in meta.text.lower():
+                    elif "prep" in text_lower or "time" in text_lower:
                         recipe_data.prep_time_minutes = self._extract_prep_time(meta.text)
-                    elif "serving" in meta.text.lower():
+                    elif "serving" in text_lower:
                         recipe_data.servings = self._extract_servings(meta.text)
             
             return await self.create_recipe(recipe_data)
@@ -84,13 +103,9 @@ class CommunityVibesService:
         try:
             # Prepare data for database insertion
             db_data = recipe_data.model_dump()
-            db_data["created_at"] = datetime.now(UTC).isoformat()
-            db_data["updated_at"] = datetime.now(UTC).isoformat()
-            
-            # Convert lists to JSON for database storage
-            db_data["ingredients"] = [ing.model_dump() for ing in recipe_data.ingredients]
-            db_data["meta"] = [meta.model_dump() for meta in recipe_data.meta]
-            db_data["details"] = [detail.model_dump() for detail in recipe_data.details]
+            now = datetime.now(UTC).isoformat()
+            db_data["created_at"] = now
+            db_data["updated_at"] = now
             
             # Insert into database
             result = await self.db.create_record(self.table_name, db_data)
@@ -110,9 +125,11 @@ class CommunityVibesService:
         try:
             result = await self.db.get_record(self.table_name, str(recipe_id))
             if result:
-                # Increment view count
-                await self._increment_view_count(recipe_id)
-                return await self._db_record_to_model(result)
+                recipe = await self._db_record_to_model(result)
+                view_count = await self.record_view(recipe_id)
+                if view_count is not None:
+                    recipe.view_count = view_count
+                return recipe
             return None
             
         except Exception as e:
@@ -142,27 +159,20 @@ class CommunityVibesService:
                 if filters.is_featured is not None:
                     db_filters["is_featured"] = filters.is_featured
             
-            # Get all recipes
-            all_recipes = await self.db.get_records(self.table_name, db_filters)
-            
-            # Apply additional filters that can't be done at DB level
-            filtered_recipes = await self._apply_advanced_filters(all_recipes, filters)
-            
-            # Apply sorting
-            sorted_recipes = await self._apply_sorting(filtered_recipes, sort_by, sort_order)
-            
-            total_count = len(sorted_recipes)
+            # Filter, sort, paginate and count in a single database round trip
+            paginated_recipes, total_count = await self.db.get_records_page(
+                self.table_name,
+                db_filters,
+                refine=self._advanced_filters(filters),
+                order_by=sort_by if sort_by in _SORT_COLUMNS else "created_at",
+                descending=sort_order == "desc",
+                offset=(page - 1) * per_page,
+                limit=per_page
+            )
             total_pages = math.ceil(total_count / per_page)
             
-            # Apply pagination
-            offset = (page - 1) * per_page
-            paginated_recipes = sorted_recipes[offset:offset + per_page]
-            
-            # Convert to models
-            recipes = []
-            for record in paginated_recipes:
-                recipe = await self._db_record_to_model(record)
-                recipes.append(recipe)
+            # Convert the whole page to models in a single validation call
+            recipes = _RECIPE_LIST_ADAPTER.validate_python(paginated_recipes)
             
             logger.info(f"Retrieved {len(recipes)} recipes (page {page}, sorted by {sort_by} {sort_order})")
             
@@ -179,22 +189,17 @@ class CommunityVibesService:
             raise
     
     async def update_recipe(self, recipe_id: UUID, update_data: CommunityVibeRecipeUpdate) -> Optional[CommunityVibeRecipe]:
-        """Update a Community Vibe recipe."""
+        """Update a Community Vibe recipe. Returns None if the recipe does not exist."""
         try:
-            # Prepare update data
-            db_data = update_data.model_dump(exclude_unset=True)
+            # Prepare update data: only the fields the client sent, with nested
+            # ingredients/meta/details dumped in full in the same pass
+            db_data = update_data.model_dump(include=update_data.model_fields_set)
             db_data["updated_at"] = datetime.now(UTC).isoformat()
             
-            # Convert complex fields to JSON if present
-            if "ingredients" in db_data and db_data["ingredients"]:
-                db_data["ingredients"] = [ing.model_dump() for ing in update_data.ingredients]
-            if "meta" in db_data and db_data["meta"]:
-                db_data["meta"] = [meta.model_dump() for meta in update_data.meta]
-            if "details" in db_data and db_data["details"]:
-                db_data["details"] = [detail.model_dump() for detail in update_data.details]
-            
             # Update in database
             result = await self.db.update_record(self.table_name, str(recipe_id), db_data)
+            if result is None:
+                return None
             
             # Convert back to model
             recipe = await self._db_record_to_model(result)
@@ -207,7 +212,7 @@ class CommunityVibesService:
             raise
     
     async def delete_recipe(self, recipe_id: UUID) -> bool:
-        """Delete a Community Vibe recipe."""
+        """Delete a Community Vibe recipe. Returns False if the recipe does not exist."""
         try:
             result = await self.db.delete_record(self.table_name, str(recipe_id))
             
@@ -221,16 +226,18 @@ class CommunityVibesService:
             raise
     
     async def rate_recipe(self, rating_data: RecipeRating) -> bool:
-        """Rate a Community Vibe recipe."""
+        """Rate a Community Vibe recipe. Returns False if the recipe does not exist."""
         try:
-            # Store the rating
-            db_rating = rating_data.model_dump()
-            db_rating["created_at"] = datetime.now(UTC).isoformat()
-            
-            await self.db.create_record(self.ratings_table, db_rating)
-            
-            # Update recipe rating statistics
-            await self._update_recipe_rating_stats(rating_data.recipe_id)
+            # Insert the rating and refresh the recipe's rating stats in one round trip
+            rated_recipe_id = await self.db.call_function("rate_community_vibes_recipe", {
+                "p_recipe_id": str(rating_data.recipe_id),
+                "p_rating": rating_data.rating,
+                "p_review": rating_data.review,
+                "p_reviewer_name": rating_data.reviewer_name,
+                "p_reviewer_email": rating_data.reviewer_email
+            })
+            if rated_recipe_id is None:
+                return False
             
             logger.info(f"Successfully rated recipe {rating_data.recipe_id}")
             return True
@@ -242,54 +249,17 @@ class CommunityVibesService:
     async def get_community_stats(self) -> RecipeStats:
         """Get Community Vibes statistics."""
         try:
-            # Get all public recipes
-            recipes = await self.db.get_records(
-                self.table_name, 
-                {"is_public": True, "is_approved": True}
-            )
-            
-            total_recipes = len(recipes)
-            
-            # Calculate unique creators
-            creators = set()
-            all_tags = []
-            featured_count = 0
-            total_rating = 0
-            rated_recipes = 0
-            
-            for recipe in recipes:
-                if recipe.get("creator_email"):
-                    creators.add(recipe["creator_email"])
-                elif recipe.get("creator_name"):
-                    creators.add(recipe["creator_name"])
-                
-                if recipe.get("tags"):
-                    all_tags.extend(recipe["tags"])
-                
-                if recipe.get("is_featured"):
-                    featured_count += 1
-                
-                if recipe.get("rating_average") and recipe.get("rating_count", 0) > 0:
-                    total_rating += recipe["rating_average"]
-                    rated_recipes += 1
-            
-            # Calculate most popular tags
-            tag_counts = {}
-            for tag in all_tags:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
-            
-            most_popular_tags = sorted(tag_counts.keys(), key=lambda x: tag_counts[x], reverse=True)[:10]
-            
-            # Calculate average rating
-            average_rating = total_rating / rated_recipes if rated_recipes > 0 else None
-            
-            return RecipeStats(
-                total_recipes=total_recipes,
-                total_creators=len(creators),
-                average_rating=average_rating,
-                most_popular_tags=most_popular_tags,
-                featured_recipes_count=featured_count
+            # Stats change slowly; reuse the last result within the memo window
+            now = time.monotonic()
+            if self._stats_memo and now - self._stats_memo[0] < _STATS_MEMO_TTL:
+                return self._stats_memo[1]
+            
+            # Aggregated in Postgres, so only the summary crosses the wire
+            stats = RecipeStats.model_validate(
+                await self.db.call_function("community_vibes_stats", {})
             )
+            self._stats_memo = (now, stats)
+            return stats
             
         except Exception as e:
             logger.error(f"Failed to get community stats: {str(e)}")
@@ -298,29 +268,16 @@ class CommunityVibesService:
     async def search_recipes(self, search_term: str, limit: int = 20) -> List[CommunityVibeRecipe]:
         """Search Community Vibe recipes by name and description."""
         try:
-            # Get all public recipes
-            recipes = await self.db.get_records(
-                self.table_name, 
+            # Matched against the GIN-indexed search_tsv column, so only hits leave the database
+            records = await self.db.search_records(
+                self.table_name,
+                "search_tsv",
+                search_term,
                 {"is_public": True, "is_approved": True},
-                limit=100  # Limit initial fetch for performance
+                limit=limit
             )
             
-            # Filter by search term
-            search_lower = search_term.lower()
-            matching_recipes = []
-            
-            for record in recipes:
-                name = record.get("name", "").lower()
-                description = record.get("description", "").lower()
-                
-                if search_lower in name or search_lower in description:
-                    recipe = await self._db_record_to_model(record)
-                    matching_recipes.append(recipe)
-                
-                if len(matching_recipes) >= limit:
-                    break
-            
-            return matching_recipes
+            return _RECIPE_LIST_ADAPTER.validate_python(records)
             
         except Exception as e:
             logger.error(f"Failed to search recipes: {str(e)}")
@@ -330,121 +287,50 @@ class CommunityVibesService:
     
     async def _db_record_to_model(self, record: Dict[str, Any]) -> CommunityVibeRecipe:
         """Convert database record to Pydantic model."""
-        # Convert JSON fields back to proper models
-        if record.get("ingredients"):
-            from app.models.cocktail import RecipeIngredient
-            record["ingredients"] = [RecipeIngredient(**ing) for ing in record["ingredients"]]
-        
-        if record.get("meta"):
-            from app.models.cocktail import RecipeMeta
-            record["meta"] = [RecipeMeta(**meta) for meta in record["meta"]]
-        
-        if record.get("details"):
-            from app.models.cocktail import RecipeDetail
-            record["details"] = [RecipeDetail(**detail) for detail in record["details"]]
-        
-        return CommunityVibeRecipe(**record)
+        # pydantic-core parses the nested JSON lists and timestamp strings in one pass
+        return CommunityVibeRecipe.model_validate(record)
     
-    async def _apply_advanced_filters(self, recipes: List[Dict], filters: Optional[CommunityVibeRecipeFilters]) -> List[Dict]:
-        """Apply filters that can't be done at database level."""
+    def _advanced_filters(self, filters: Optional[CommunityVibeRecipeFilters]):
+        """Build a query refinement for the filters beyond plain equality matches."""
         if not filters:
-            return recipes
-        
-        filtered = recipes
-        
-        # Search filter
-        if filters.search:
-            search_lower = filters.search.lower()
-            filtered = [
-                r for r in filtered 
-                if search_lower in r.get("name", "").lower() or 
-                   search_lower in r.get("description", "").lower()
-            ]
-        
-        # Rating filter
-        if filters.min_rating:
-            filtered = [
-                r for r in filtered 
-                if r.get("rating_average") and r["rating_average"] >= filters.min_rating
-            ]
-        
-        # Prep time filters
-        if filters.min_prep_time:
-            filtered = [
-                r for r in filtered 
-                if r.get("prep_time_minutes") and r["prep_time_minutes"] >= filters.min_prep_time
-            ]
-        
-        if filters.max_prep_time:
-            filtered = [
-                r for r in filtered 
-                if r.get("prep_time_minutes") and r["prep_time_minutes"] <= filters.max_prep_time
-            ]
-        
-        # Tags filter
-        if filters.tags:
-            filtered = [
-                r for r in filtered 
-                if r.get("tags") and any(tag in r["tags"] for tag in filters.tags)
-            ]
+            return None
         
-        return filtered
-    
-    async def _apply_sorting(self, recipes: List[Dict], sort_by: str, sort_order: str) -> List[Dict]:
-        """Apply sorting to the list of recipes."""
-        try:
-            if sort_by == "created_at":
-                return sorted(recipes, key=lambda r: r.get("created_at", ""), reverse=sort_order == "desc")
-            elif sort_by == "rating_average":
-                return sorted(recipes, key=lambda r: r.get("rating_average", 0), reverse=sort_order == "desc")
-            elif sort_by == "prep_time_minutes":
-                return sorted(recipes, key=lambda r: r.get("prep_time_minutes", 0), reverse=sort_order == "desc")
-            elif sort_by == "name":
-                return sorted(recipes, key=lambda r: r.get("name", "").lower(), reverse=sort_order == "desc")
-            else:
-                # Default to created_at sorting
-                return sorted(recipes, key=lambda r: r.get("created_at", ""), reverse=sort_order == "desc")
-        except Exception as e:
-            logger.warning(f"Error sorting recipes: {e}, returning unsorted list")
-            return recipes
-    
-    async def _increment_view_count(self, recipe_id: UUID) -> None:
-        """Increment the view count for a recipe."""
-        try:
-            recipe = await self.db.get_record(self.table_name, str(recipe_id))
-            if recipe:
-                current_views = recipe.get("view_count", 0)
-                await self.db.update_record(
-                    self.table_name, 
-                    str(recipe_id), 
-                    {"view_count": current_views + 1}
+        def refine(query):
+            # Search filter, served by the search_tsv full-text index
+            if filters.search:
+                query = query.text_search(
+                    "search_tsv", filters.search, options={"type": "plain", "config": "english"}
                 )
-        except Exception as e:
-            logger.warning(f"Failed to increment view count for recipe {recipe_id}: {str(e)}")
+            
+            # Rating filter
+            if filters.min_rating:
+                query = query.gte("rating_average", filters.min_rating)
+            
+            # Prep time filters
+            if filters.min_prep_time:
+                query = query.gte("prep_time_minutes", filters.min_prep_time)
+            if filters.max_prep_time:
+                query = query.lte("prep_time_minutes", filters.max_prep_time)
+            
+            # Tags filter: recipes sharing at least one tag
+            if filters.tags:
+                query = query.ov("tags", filters.tags)
+            
+            return query
+        
+        return refine
     
-    async def _update_recipe_rating_stats(self, recipe_id: UUID) -> None:
-        """Update recipe rating statistics after a new rating."""
+    async def record_view(self, recipe_id: UUID) -> Optional[int]:
+        """Count a view of a recipe. Returns the new view count, or None if it was not recorded."""
         try:
-            # Get all ratings for this recipe
-            ratings = await self.db.get_records(
-                self.ratings_table, 
-                {"recipe_id": str(recipe_id)}
+            # Atomic increment in the database; no read-modify-write race between viewers
+            return await self.db.call_function(
+                "increment_community_vibes_recipe_views",
+                {"p_recipe_id": str(recipe_id)}
             )
-            
-            if ratings:
-                total_rating = sum(r["rating"] for r in ratings)
-                avg_rating = total_rating / len(ratings)
-                
-                await self.db.update_record(
-                    self.table_name,
-                    str(recipe_id),
-                    {
-                        "rating_average": round(avg_rating, 2),
-                        "rating_count": len(ratings)
-                    }
-                )
         except Exception as e:
-            logger.warning(f"Failed to update rating stats for recipe {recipe_id}: {str(e)}")
+            logger.warning(f"Failed to increment view count for recipe {recipe_id}: {str(e)}")
+            return None
     
     def _extract_difficulty(self, meta_text: str) -> Optional[str]:
         """Extract difficulty level from meta text."""
@@ -461,9 +347,8 @@ class CommunityVibesService:
     
     def _extract_prep_time(self, meta_text: str) -> Optional[int]:
         """Extract prep time in minutes from meta text."""
-        import re
         # Look for numbers followed by time units
-        time_match = re.search(r'(\d+)\s*(minute|min|hour|hr)', meta_text.lower())
+        time_match = _PREP_TIME_RE.search(meta_text.lower())
         if time_match:
             value = int(time_match.group(1))
             unit = time_match.group(2)
@@ -474,16 +359,15 @@ class CommunityVibesService:
     
     def _extract_servings(self, meta_text: str) -> Optional[int]:
         """Extract number of servings from meta text."""
-        import re
         # Look for numbers followed by serving indicators
-        serving_match = re.search(r'(\d+)\s*(serving|portion|drink)', meta_text.lower())
+        serving_match = _SERVINGS_RE.search(meta_text.lower())
         if serving_match:
             return int(serving_match.group(1))
         return None
 
-# Global service instance
+# Global service instance, shared by every request instead of rebuilt per call
+community_vibes_service = CommunityVibesService()
+
 def get_community_vibes_service() -> CommunityVibesService:
     """Get the Community Vibes service instance."""
-    return CommunityVibesService()
-
-community_vibes_service = get_community_vibes_service() 
\ No newline at end of file
+    return community_vibes_service
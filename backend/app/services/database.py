@@ -3,31 +3,44 @@ Supabase database service for Vibe Bar API.
 Handles database connections and operations for Community Vibes recipes.
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Tuple
+from postgrest.exceptions import APIError
 from supabase import create_client, Client
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
+class DatabaseError(Exception):
+    """Custom exception for database-related errors"""
+
 class DatabaseService:
     """Service for handling Supabase database operations."""
     
     def __init__(self):
         """Initialize the database service with Supabase client."""
         self._client: Optional[Client] = None
+        # The Supabase client is synchronous; its calls run on this pool so they
+        # overlap with each other and never block the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.DB_POOL_SIZE,
+            thread_name_prefix="supabase"
+        )
+        self._in_flight = 0
         self._initialize_client()
     
     def _initialize_client(self) -> None:
         """Initialize the Supabase client."""
         try:
-            if not config.validate_supabase_config():
+            if not config.SUPABASE_CONFIGURED:
                 logger.warning("Supabase configuration is incomplete. Database operations will be disabled.")
                 return
             
             # Use service key for testing/development, anon key for production
             api_key = config.SUPABASE_ANON_KEY
-            if config.is_development() and config.SUPABASE_SERVICE_KEY:
+            if config.IS_DEVELOPMENT and config.SUPABASE_SERVICE_KEY:
                 api_key = config.SUPABASE_SERVICE_KEY
                 logger.info("Using service key for development environment")
             
@@ -50,6 +63,22 @@ class DatabaseService:
         """Check if the database connection is available."""
         return self._client is not None
     
+    def pool_status(self) -> Dict[str, int]:
+        """Report how busy the query pool is."""
+        return {"size": config.DB_POOL_SIZE, "in_flight": self._in_flight}
+    
+    def close(self) -> None:
+        """Shut down the query pool, dropping queries that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def _execute(self, query):
+        """Run a Supabase query on the pool without blocking the event loop."""
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, query.execute)
+        finally:
+            self._in_flight -= 1
+    
     async def health_check(self) -> Dict[str, Any]:
         """Perform a health check on the database connection."""
         if not self.is_connected():
@@ -61,11 +90,14 @@ class DatabaseService:
         
         try:
             # Try a simple query to test the connection
-            response = self._client.table("community_vibes_recipes").select("id").limit(1).execute()
+            response = await self._execute(
+                self._client.table("community_vibes_recipes").select("id").limit(1)
+            )
             return {
                 "status": "success",
                 "message": "Database connection healthy",
-                "connected": True
+                "connected": True,
+                "pool": self.pool_status()
             }
         except Exception as e:
             logger.error(f"Database health check failed: {str(e)}")
@@ -78,15 +110,15 @@ class DatabaseService:
     async def create_record(self, table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new record in the specified table."""
         if not self.is_connected():
-            raise Exception("Database client not initialized")
+            raise DatabaseError("Database client not initialized")
         
         try:
-            response = self._client.table(table_name).insert(data).execute()
+            response = await self._execute(self._client.table(table_name).insert(data))
             if response.data:
                 logger.info(f"Successfully created record in {table_name}")
                 return response.data[0]
             else:
-                raise Exception("No data returned from insert operation")
+                raise DatabaseError("No data returned from insert operation")
         except Exception as e:
             logger.error(f"Failed to create record in {table_name}: {str(e)}")
             raise
@@ -94,10 +126,10 @@ class DatabaseService:
     async def get_record(self, table_name: str, record_id: str) -> Optional[Dict[str, Any]]:
         """Get a record by ID from the specified table."""
         if not self.is_connected():
-            raise Exception("Database client not initialized")
+            raise DatabaseError("Database client not initialized")
         
         try:
-            response = self._client.table(table_name).select("*").eq("id", record_id).execute()
+            response = await self._execute(self._client.table(table_name).select("*").eq("id", record_id))
             if response.data:
                 return response.data[0]
             return None
@@ -109,7 +141,7 @@ class DatabaseService:
                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get multiple records from the specified table with optional filters."""
         if not self.is_connected():
-            raise Exception("Database client not initialized")
+            raise DatabaseError("Database client not initialized")
         
         try:
             query = self._client.table(table_name).select("*")
@@ -123,38 +155,117 @@ class DatabaseService:
             if limit:
                 query = query.limit(limit)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.data or []
         except Exception as e:
             logger.error(f"Failed to get records from {table_name}: {str(e)}")
             raise
     
+    async def get_records_page(self, table_name: str, filters: Optional[Dict[str, Any]] = None,
+                               refine: Optional[Callable[[Any], Any]] = None,
+                               order_by: str = "created_at", descending: bool = True,
+                               offset: int = 0, limit: int = 20) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get one sorted page of records together with the total number of matches.
+        refine can add further filters to the query builder beyond equality matches.
+        """
+        if not self.is_connected():
+            raise DatabaseError("Database client not initialized")
+        
+        def build_query(**select_options):
+            # count="exact" returns the total alongside the rows, so no separate COUNT query
+            query = self._client.table(table_name).select("*", count="exact", **select_options)
+            if filters:
+                for key, value in filters.items():
+                    query = query.eq(key, value)
+            return refine(query) if refine else query
+        
+        try:
+            # postgrest-py has no nulls-last modifier, so NULLs follow Postgres' default:
+            # last when ascending, first when descending
+            query = build_query().order(order_by, desc=descending, nullsfirst=False)
+            response = await self._execute(query.range(offset, offset + limit - 1))
+            return response.data or [], response.count or 0
+        except APIError as e:
+            # PostgREST rejects a range that starts past the last match; that page is
+            # simply empty, but the caller still needs the total
+            if e.code != "PGRST103":
+                logger.error(f"Failed to get records page from {table_name}: {str(e)}")
+                raise
+            response = await self._execute(build_query(head=True))
+            return [], response.count or 0
+        except Exception as e:
+            logger.error(f"Failed to get records page from {table_name}: {str(e)}")
+            raise
+    
+    async def search_records(self, table_name: str, column: str, search_term: str,
+                             filters: Optional[Dict[str, Any]] = None,
+                             limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Full-text search a tsvector column, with optional equality filters."""
+        if not self.is_connected():
+            raise DatabaseError("Database client not initialized")
+        
+        try:
+            query = self._client.table(table_name).select("*").text_search(
+                column, search_term, options={"type": "plain", "config": "english"}
+            )
+            
+            # Apply filters if provided
+            if filters:
+                for key, value in filters.items():
+                    query = query.eq(key, value)
+            
+            # Apply limit if provided
+            if limit:
+                query = query.limit(limit)
+            
+            response = await self._execute(query)
+            return response.data or []
+        except Exception as e:
+            logger.error(f"Failed to search records in {table_name}: {str(e)}")
+            raise
+    
+    async def call_function(self, function_name: str, params: Dict[str, Any]) -> Any:
+        """Call a Postgres function through the Supabase RPC endpoint."""
+        if not self.is_connected():
+            raise DatabaseError("Database client not initialized")
+        
+        try:
+            response = await self._execute(self._client.rpc(function_name, params))
+            return response.data
+        except Exception as e:
+            logger.error(f"Failed to call database function {function_name}: {str(e)}")
+            raise
+    
     async def update_record(self, table_name: str, record_id: str, 
-                           data: Dict[str, Any]) -> Dict[str, Any]:
-        """Update a record by ID in the specified table."""
+                           data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update a record by ID in the specified table. Returns None if no record has that ID."""
         if not self.is_connected():
-            raise Exception("Database client not initialized")
+            raise DatabaseError("Database client not initialized")
         
         try:
-            response = self._client.table(table_name).update(data).eq("id", record_id).execute()
+            response = await self._execute(self._client.table(table_name).update(data).eq("id", record_id))
             if response.data:
                 logger.info(f"Successfully updated record in {table_name}")
                 return response.data[0]
-            else:
-                raise Exception("No data returned from update operation")
+            return None
         except Exception as e:
             logger.error(f"Failed to update record in {table_name}: {str(e)}")
             raise
     
     async def delete_record(self, table_name: str, record_id: str) -> bool:
-        """Delete a record by ID from the specified table."""
+        """Delete a record by ID from the specified table. Returns False if no record has that ID."""
         if not self.is_connected():
-            raise Exception("Database client not initialized")
+            raise DatabaseError("Database client not initialized")
         
         try:
-            response = self._client.table(table_name).delete().eq("id", record_id).execute()
-            logger.info(f"Successfully deleted record from {table_name}")
-            return True
+            # The deleted rows come back in the same round trip, so an empty
+            # result doubles as the existence check
+            response = await self._execute(self._client.table(table_name).delete().eq("id", record_id))
+            if response.data:
+                logger.info(f"Successfully deleted record from {table_name}")
+                return True
+            return False
         except Exception as e:
             logger.error(f"Failed to delete record from {table_name}: {str(e)}")
             raise
@@ -4,15 +4,14 @@ Handles AI model calls with retry logic and fallback models.
 """
 
 import asyncio
+import functools
 import logging
-from typing import Dict, List, Optional, Any, Union
-from datetime import datetime, UTC
-import httpx
-from openai import AsyncOpenAI
+from typing import AsyncIterator, Dict, List, Optional, Any, Union
+from datetime import datetime
 from pydantic import BaseModel, Field
-import time
 
 from app.config import config
+from app.models.common import utc_now
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -29,7 +28,7 @@ class AIResponse(BaseModel):
     tokens_used: Optional[int] = Field(None, description="Tokens consumed")
     finish_reason: Optional[str] = Field(None, description="Why the generation stopped")
     response_time: float = Field(..., description="Response time in seconds")
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_at: datetime = Field(default_factory=utc_now)
 
 class OpenRouterError(Exception):
     """Custom exception for OpenRouter-related errors"""
@@ -41,14 +40,27 @@ class OpenRouterService:
     """Service for interacting with OpenRouter AI models"""
     
     def __init__(self):
-        if not config.validate_openrouter_config():
+        if not config.OPENROUTER_CONFIGURED:
             raise OpenRouterError("OpenRouter API key is not configured")
         
-        # Initialize OpenAI client with OpenRouter settings
+        # The OpenAI SDK is heavy to import, so load it only when the service is built
+        import httpx
+        from openai import AsyncOpenAI
+
+        # Initialize OpenAI client with OpenRouter settings, on a pooled HTTP client
+        # so requests reuse warm TLS connections instead of opening new ones
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=config.AI_TIMEOUT
+        )
         self.client = AsyncOpenAI(
             api_key=config.OPENROUTER_API_KEY,
-            base_url=config.OPENROUTER_BASE_URL
+            base_url=config.OPENROUTER_BASE_URL,
+            http_client=self._http_client
         )
+
+        # Bound in-flight completions so a burst cannot stampede the upstream rate limit
+        self._semaphore = asyncio.Semaphore(config.AI_MAX_CONCURRENCY)
         
         self.default_model = config.DEFAULT_AI_MODEL
         self.fallback_model = config.FALLBACK_AI_MODEL
@@ -81,7 +93,8 @@ class OpenRouterService:
             logger.debug(f"Making completion request to {model} with {len(messages)} messages")
             
             # Make the API call
-            response = await self.client.chat.completions.create(**request_params)
+            async with self._semaphore:
+                response = await self.client.chat.completions.create(**request_params)
             
             response_time = asyncio.get_event_loop().time() - start_time
             
@@ -174,6 +187,48 @@ class OpenRouterService:
         
         raise OpenRouterError("All attempts failed with both primary and fallback models")
     
+    async def stream_complete(
+        self,
+        messages: List[AIMessage],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion from OpenRouter, yielding content deltas as they arrive.
+        No retries or fallback: once tokens have been sent they cannot be taken back.
+        """
+        target_model = model or self.default_model
+
+        # The concurrency slot is held until the stream is finished or abandoned
+        async with self._semaphore:
+            try:
+                stream = await self.client.chat.completions.create(
+                    model=target_model,
+                    messages=[{"role": msg.role, "content": msg.content} for msg in messages],
+                    temperature=temperature or config.AI_TEMPERATURE,
+                    max_tokens=max_tokens or config.AI_MAX_TOKENS,
+                    stream=True,
+                    **kwargs
+                )
+            except Exception as e:
+                logger.error(f"Error opening completion stream to {target_model}: {e}")
+                raise OpenRouterError(f"API call failed: {str(e)}")
+
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            except Exception as e:
+                logger.error(f"Completion stream from {target_model} failed: {e}")
+                raise OpenRouterError(f"Stream failed: {str(e)}")
+            finally:
+                await stream.close()
+
     async def get_available_models(self) -> List[str]:
         """
         Get list of available models from OpenRouter.
@@ -219,14 +274,12 @@ class OpenRouterService:
                 "test_successful": False
             }
 
-# Global service instance
-openrouter_service: Optional[OpenRouterService] = None
+    async def aclose(self) -> None:
+        """Release the pooled HTTP connections."""
+        await self._http_client.aclose()
 
+# Global service instance, built lazily on first use and reused across requests
+@functools.lru_cache(maxsize=1)
 def get_openrouter_service() -> OpenRouterService:
     """Get or create the OpenRouter service instance"""
-    global openrouter_service
-    
-    if openrouter_service is None:
-        openrouter_service = OpenRouterService()
-    
-    return openrouter_service 
\ No newline at end of file
+    return OpenRouterService()
@@ -0,0 +1,119 @@
+"""
+In-memory cache for AI-generated cocktail recipes.
+Identical preference payloads are answered from the cache instead of calling the LLM again.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+from pydantic import BaseModel
+
+from app.config import config
+from app.models.cocktail import CocktailRecipe
+
+logger = logging.getLogger(__name__)
+
+class RecipeCache:
+    """LRU cache of generated recipes keyed by a hash of the request preferences"""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (stored_at, serialized recipe)
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        # key -> pending generation shared by concurrent identical requests
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def make_key(preferences: BaseModel) -> str:
+        """Build a stable cache key from the request preferences"""
+        payload = orjson.dumps(
+            preferences.model_dump(mode="json", exclude_none=True),
+            option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[CocktailRecipe]:
+        """Return a cached recipe, or None on a miss or expired entry"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, recipe_json = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        # Each hit gets its own instance so callers cannot mutate the cached copy
+        return CocktailRecipe.model_validate_json(recipe_json)
+
+    def set(self, key: str, recipe: CocktailRecipe) -> None:
+        """Store a recipe, evicting the least recently used entry when full"""
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = (time.monotonic(), recipe.model_dump_json().encode())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_generate(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[CocktailRecipe]]
+    ) -> CocktailRecipe:
+        """
+        Return the cached recipe for key, or run loader and cache its result.
+        Concurrent calls for the same key share a single loader call.
+        """
+        while True:
+            recipe = self.get(key)
+            if recipe is not None:
+                logger.info("Recipe cache hit for key %s", key)
+                return recipe
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+
+            try:
+                recipe = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The request that owned the generation went away; try again
+                if pending.cancelled():
+                    continue
+                raise
+            logger.info("Joined in-flight recipe generation for key %s", key)
+            return recipe.model_copy(deep=True)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            recipe = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+        future.set_result(recipe)
+        self.set(key, recipe)
+        return recipe
+
+    def clear(self) -> None:
+        """Drop every cached recipe"""
+        self._entries.clear()
+
+# Global cache instance
+recipe_cache = RecipeCache(maxsize=config.RECIPE_CACHE_SIZE, ttl=config.RECIPE_CACHE_TTL)
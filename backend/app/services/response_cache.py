@@ -0,0 +1,82 @@
+"""
+Redis cache-aside layer for Community Vibes read endpoints.
+Disabled unless REDIS_URL is set; Redis errors are logged and treated as cache misses.
+"""
+
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import orjson
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+# Bump the version segment to invalidate every key after a payload shape change
+KEY_PREFIX = "cv:v1"
+LIST_PATTERN = f"{KEY_PREFIX}:list:*"
+STATS_KEY = f"{KEY_PREFIX}:stats"
+
+class ResponseCache:
+    """Caches JSON-ready response payloads in Redis, keyed by request parameters"""
+
+    def __init__(self, url: Optional[str]):
+        self._client = None
+        if url and url.strip():
+            # redis is only needed when a cache is configured
+            import redis.asyncio as redis
+            self._client = redis.from_url(url)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a Redis server is configured"""
+        return self._client is not None
+
+    @staticmethod
+    def recipe_key(recipe_id: UUID) -> str:
+        """Key for a single recipe payload"""
+        return f"{KEY_PREFIX}:recipe:{recipe_id}"
+
+    @staticmethod
+    def list_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """Key for a recipe list payload, hashed from the endpoint and its parameters"""
+        payload = orjson.dumps({"endpoint": endpoint, **params}, option=orjson.OPT_SORT_KEYS)
+        return f"{KEY_PREFIX}:list:{hashlib.blake2b(payload, digest_size=16).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached payload, or None on a miss"""
+        if self._client is None:
+            return None
+        try:
+            cached = await self._client.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed for {key}: {e}")
+            return None
+        return orjson.loads(cached) if cached is not None else None
+
+    async def set(self, key: str, payload: Any, ttl: int) -> None:
+        """Store a JSON-ready payload for ttl seconds"""
+        if self._client is None:
+            return
+        try:
+            await self._client.set(key, orjson.dumps(payload), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Response cache write failed for {key}: {e}")
+
+    async def invalidate(self, recipe_id: Optional[UUID] = None) -> None:
+        """Drop cached lists and stats, and the given recipe if any, after a write"""
+        if self._client is None:
+            return
+        try:
+            keys = [STATS_KEY]
+            if recipe_id is not None:
+                keys.append(self.recipe_key(recipe_id))
+            keys.extend([key async for key in self._client.scan_iter(match=LIST_PATTERN, count=500)])
+            await self._client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Response cache invalidation failed: {e}")
+
+# Global cache instance
+response_cache = ResponseCache(config.REDIS_URL)
@@ -44,7 +44,12 @@ CREATE TABLE community_vibes_recipes (
     -- Status and moderation
     is_public BOOLEAN DEFAULT TRUE,
     is_featured BOOLEAN DEFAULT FALSE,
-    is_approved BOOLEAN DEFAULT TRUE
+    is_approved BOOLEAN DEFAULT TRUE,
+    
+    -- Full-text search document, kept in sync by Postgres
+    search_tsv TSVECTOR GENERATED ALWAYS AS (
+        to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))
+    ) STORED
 );
 
 -- Create Recipe Ratings table
@@ -75,6 +80,7 @@ CREATE INDEX idx_community_vibes_recipes_featured ON community_vibes_recipes(is_
 CREATE INDEX idx_community_vibes_recipes_tags ON community_vibes_recipes USING GIN(tags);
 CREATE INDEX idx_community_vibes_recipes_flavor_profile ON community_vibes_recipes USING GIN(flavor_profile);
 CREATE INDEX idx_community_vibes_recipes_vibe ON community_vibes_recipes(vibe);
+CREATE INDEX idx_community_vibes_recipes_search ON community_vibes_recipes USING GIN(search_tsv);
 
 CREATE INDEX idx_recipe_ratings_recipe_id ON recipe_ratings(recipe_id);
 CREATE INDEX idx_recipe_ratings_created_at ON recipe_ratings(created_at DESC);
@@ -94,6 +100,71 @@ CREATE TRIGGER update_community_vibes_recipes_updated_at
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Record a rating and refresh the recipe's rating stats in a single statement.
+-- Returns NULL when the recipe does not exist.
+CREATE OR REPLACE FUNCTION rate_community_vibes_recipe(
+    p_recipe_id UUID,
+    p_rating INTEGER,
+    p_review TEXT DEFAULT NULL,
+    p_reviewer_name VARCHAR(50) DEFAULT NULL,
+    p_reviewer_email VARCHAR(255) DEFAULT NULL
+)
+RETURNS UUID AS $$
+    WITH inserted AS (
+        INSERT INTO recipe_ratings (recipe_id, rating, review, reviewer_name, reviewer_email)
+        SELECT id, p_rating, p_review, p_reviewer_name, p_reviewer_email
+        FROM community_vibes_recipes
+        WHERE id = p_recipe_id
+        RETURNING recipe_id, rating
+    )
+    UPDATE community_vibes_recipes AS r
+    SET rating_count = s.total_count,
+        rating_average = ROUND(s.total_rating::NUMERIC / s.total_count, 2)
+    FROM inserted AS i,
+        -- The new row is not visible to this snapshot yet, so add it in by hand
+        LATERAL (
+            SELECT COUNT(*) + 1 AS total_count, COALESCE(SUM(rating), 0) + i.rating AS total_rating
+            FROM recipe_ratings
+            WHERE recipe_id = i.recipe_id
+        ) AS s
+    WHERE r.id = i.recipe_id
+    RETURNING r.id;
+$$ LANGUAGE sql;
+
+-- Count a recipe view atomically. Returns the new view count, or NULL when the
+-- recipe does not exist.
+CREATE OR REPLACE FUNCTION increment_community_vibes_recipe_views(p_recipe_id UUID)
+RETURNS INTEGER AS $$
+    UPDATE community_vibes_recipes
+    SET view_count = view_count + 1
+    WHERE id = p_recipe_id
+    RETURNING view_count;
+$$ LANGUAGE sql;
+
+-- Aggregate Community Vibes statistics over public, approved recipes in one query
+CREATE OR REPLACE FUNCTION community_vibes_stats()
+RETURNS JSON AS $$
+    SELECT json_build_object(
+        'total_recipes', COUNT(*),
+        'total_creators', COUNT(DISTINCT COALESCE(NULLIF(creator_email, ''), NULLIF(creator_name, ''))),
+        'average_rating', AVG(rating_average) FILTER (WHERE rating_average > 0 AND rating_count > 0),
+        'featured_recipes_count', COUNT(*) FILTER (WHERE is_featured),
+        'most_popular_tags', COALESCE((
+            SELECT json_agg(tag ORDER BY uses DESC, tag)
+            FROM (
+                SELECT tag, COUNT(*) AS uses
+                FROM community_vibes_recipes, unnest(tags) AS tag
+                WHERE is_public AND is_approved
+                GROUP BY tag
+                ORDER BY uses DESC, tag
+                LIMIT 10
+            ) AS top_tags
+        ), '[]'::json)
+    )
+    FROM community_vibes_recipes
+    WHERE is_public AND is_approved;
+$$ LANGUAGE sql STABLE;
+
 -- Create Row Level Security (RLS) policies
 ALTER TABLE community_vibes_recipes ENABLE ROW LEVEL SECURITY;
 ALTER TABLE recipe_ratings ENABLE ROW LEVEL SECURITY;
@@ -2,6 +2,7 @@
 Pytest configuration and shared fixtures for vibe-bar backend tests.
 """
 
+import httpx
 import pytest
 from supabase import create_client, Client
 from app.config import config
@@ -17,6 +18,15 @@ def sample_test_data():
     }
 
 
+@pytest.fixture
+async def client():
+    """HTTP client that calls the app in-process."""
+    from app.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
 @pytest.fixture
 def test_database_service():
     """Provide a database service using service key for testing."""
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Pytest-compatible tests for the batch endpoint
+"""
+
+import pytest
+
+
+async def test_batch_runs_each_sub_request(client):
+    """Every sub-request is answered and tagged with its id"""
+    response = await client.post("/api/batch", json={
+        "requests": [
+            {"id": "test", "url": "/api/test"},
+            {"id": "missing", "url": "/api/does-not-exist"}
+        ]
+    })
+
+    assert response.status_code == 200
+    results = {item["id"]: item for item in response.json()["data"]["responses"]}
+    assert results["test"]["status"] == 200
+    assert results["test"]["body"]["data"]["cors_working"] is True
+    assert results["missing"]["status"] == 404
+
+
+async def test_batch_rejects_nested_batches(client):
+    """A batch cannot call /api/batch itself"""
+    response = await client.post("/api/batch", json={
+        "requests": [{"id": "nested", "method": "POST", "url": "/api/batch"}]
+    })
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("url", ["/api/%62atch", "/api/./batch", "/api/../api/batch", "/api//batch"])
+async def test_batch_rejects_disguised_batch_paths(url, client):
+    """Encoded and dot-segment spellings of /api/batch are rejected too"""
+    response = await client.post("/api/batch", json={
+        "requests": [{"id": "nested", "method": "POST", "url": url}]
+    })
+
+    assert response.status_code == 422
+
+
+async def test_batch_refuses_calls_from_another_batch(client):
+    """A request carrying the sub-request marker cannot start a batch"""
+    response = await client.post(
+        "/api/batch",
+        json={"requests": [{"id": "test", "url": "/api/test"}]},
+        headers={"X-Batch-Sub-Request": "1"}
+    )
+
+    assert response.status_code == 400
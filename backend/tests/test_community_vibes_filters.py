@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Pytest-compatible tests for Community Vibes list filter parsing
+"""
+
+
+async def test_unknown_difficulty_level_is_rejected(client):
+    """An unknown difficulty level is a 422, not a filter value outside the Literal"""
+    response = await client.get("/api/community-vibes/recipes", params={"difficulty_level": "impossible"})
+
+    assert response.status_code == 422
+    assert "Easy, Medium, Hard, Expert" in response.json()["detail"]
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Pytest-compatible tests for the in-memory recipe cache
+"""
+
+import asyncio
+import pytest
+from app.models import UserPreferences, CocktailRecipe, RecipeIngredient, RecipeMeta, RecipeDetail
+from app.services.recipe_cache import RecipeCache
+
+
+def make_recipe(title: str = "Test Cocktail") -> CocktailRecipe:
+    """Build a minimal cocktail recipe"""
+    return CocktailRecipe(
+        recipeTitle=title,
+        recipeDescription="A test cocktail",
+        recipeMeta=[RecipeMeta(text="Easy")],
+        recipeIngredients=[RecipeIngredient(name="Gin", amount="2 oz")],
+        recipeInstructions=["Mix well"],
+        recipeDetails=[RecipeDetail(title="Glass", content="Rocks")]
+    )
+
+
+def test_key_is_stable_for_equal_preferences():
+    """Equal preferences map to the same key, different ones do not"""
+    first = UserPreferences(ingredients=["gin"], flavors=["citrusy"], vibe="relaxed")
+    second = UserPreferences(vibe="relaxed", flavors=["citrusy"], ingredients=["gin"])
+    other = UserPreferences(ingredients=["rum"], flavors=["citrusy"], vibe="relaxed")
+
+    assert RecipeCache.make_key(first) == RecipeCache.make_key(second)
+    assert RecipeCache.make_key(first) != RecipeCache.make_key(other)
+
+
+async def test_get_or_generate_reuses_cached_recipe():
+    """The loader only runs on a cache miss"""
+    cache = RecipeCache(maxsize=10, ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return make_recipe()
+
+    first = await cache.get_or_generate("key", loader)
+    second = await cache.get_or_generate("key", loader)
+
+    assert len(calls) == 1
+    assert first == second
+    assert first is not second
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Entries beyond maxsize are evicted oldest first"""
+    cache = RecipeCache(maxsize=2, ttl=60)
+    cache.set("a", make_recipe("A"))
+    cache.set("b", make_recipe("B"))
+    cache.get("a")
+    cache.set("c", make_recipe("C"))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_expired_entries_are_not_returned():
+    """Entries older than the TTL count as misses"""
+    cache = RecipeCache(maxsize=10, ttl=-1)
+    cache.set("key", make_recipe())
+
+    assert cache.get("key") is None
+
+
+def test_zero_size_disables_cache():
+    """maxsize=0 turns the cache off"""
+    cache = RecipeCache(maxsize=0, ttl=60)
+    cache.set("key", make_recipe())
+
+    assert cache.get("key") is None
+
+
+async def test_concurrent_requests_share_one_generation():
+    """Identical requests issued together trigger a single loader call"""
+    cache = RecipeCache(maxsize=10, ttl=60)
+    calls = []
+    release = asyncio.Event()
+
+    async def loader():
+        calls.append(1)
+        await release.wait()
+        return make_recipe()
+
+    tasks = [asyncio.create_task(cache.get_or_generate("key", loader)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+
+
+async def test_failed_generation_is_not_cached():
+    """A loader error propagates and the next call retries"""
+    cache = RecipeCache(maxsize=10, ttl=60)
+
+    async def failing_loader():
+        raise ValueError("AI returned invalid JSON response")
+
+    async def loader():
+        return make_recipe()
+
+    with pytest.raises(ValueError):
+        await cache.get_or_generate("key", failing_loader)
+
+    recipe = await cache.get_or_generate("key", loader)
+    assert recipe.recipeTitle == "Test Cocktail"
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Pytest-compatible tests for the Redis response cache
+"""
+
+from uuid import uuid4
+
+from app.services.response_cache import ResponseCache
+
+
+def test_list_key_ignores_parameter_order():
+    """Equal parameters map to the same key regardless of order"""
+    first = ResponseCache.list_key("recipes", {"page": 1, "per_page": 20})
+    second = ResponseCache.list_key("recipes", {"per_page": 20, "page": 1})
+    other = ResponseCache.list_key("recipes", {"page": 2, "per_page": 20})
+
+    assert first == second
+    assert first != other
+    assert first.startswith("cv:v1:list:")
+
+
+def test_list_key_depends_on_endpoint():
+    """The same parameters on different endpoints do not collide"""
+    params = {"page": 1, "per_page": 20}
+    assert ResponseCache.list_key("recipes", params) != ResponseCache.list_key("by-creator", params)
+
+
+async def test_cache_without_url_is_a_no_op():
+    """Without REDIS_URL every read is a miss and writes are ignored"""
+    cache = ResponseCache(None)
+    key = ResponseCache.recipe_key(uuid4())
+
+    await cache.set(key, {"name": "Test"}, ttl=60)
+    await cache.invalidate()
+
+    assert cache.enabled is False
+    assert await cache.get(key) is None
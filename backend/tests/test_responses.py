@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Pytest-compatible tests for the prebuilt response envelope
+"""
+
+from uuid import uuid4
+
+import orjson
+from app.models import APIResponse
+from app.models.common import utc_now
+from app.routers import ok
+
+
+def test_ok_matches_api_response_shape():
+    """ok() renders the same keys and value formats as APIResponse"""
+    recipe_id = uuid4()
+    created_at = utc_now()
+    data = {"recipe_id": recipe_id, "created_at": created_at}
+
+    body = orjson.loads(ok("Done", data).body)
+    expected = orjson.loads(APIResponse(message="Done", data=data).model_dump_json())
+
+    assert body.keys() == expected.keys()
+    assert body["data"] == expected["data"]
+    assert body["timestamp"].endswith("Z")
+
+
+def test_ok_status_code():
+    """Endpoints that create resources can pass their own status code"""
+    assert ok("Created", status_code=201).status_code == 201
+    assert ok("Fine").status_code == 200